@@ -6,6 +6,17 @@ import torch.optim as optim
 import numpy as np
 import matplotlib.pyplot as plt
 import pickle
+import threading
+import contextlib
+
+# Network input shapes are fixed, so let cuDNN pick and cache the fastest kernels.
+T.backends.cudnn.benchmark = True
+
+
+def layer_norm(x, norm):
+    # Functional call with the module's affine parameters: skips nn.Module
+    # dispatch in forward() and gives inductor a plain op to fuse with ReLU.
+    return F.layer_norm(x, norm.normalized_shape, norm.weight, norm.bias, norm.eps)
 
 
 class OUActionNoise(object):
@@ -15,19 +26,28 @@ class OUActionNoise(object):
         self.sigma = sigma
         self.dt = dt
         self.x0 = x0
+        self.rng = np.random.default_rng()
+        # Scratch buffers reused on every step so the OU update itself needs no
+        # temporaries; only the returned copy of the state is allocated.
+        self._drift_buf = np.empty(self.mu.shape)
+        self._noise_buf = np.empty(self.mu.shape)
         self.reset()
 
     def __call__(self):
-        x = (
-            self.x_prev
-            + self.theta * (self.mu - self.x_prev) * self.dt
-            + self.sigma * np.sqrt(self.dt) * np.random.normal(size=self.mu.shape)
-        )
-        self.x_prev = x
-        return x
+        # x += theta * (mu - x) * dt + sigma * sqrt(dt) * N(0, 1), in place.
+        self.rng.standard_normal(out=self._noise_buf)
+        self._noise_buf *= self.sigma * np.sqrt(self.dt)
+        np.subtract(self.mu, self.x_prev, out=self._drift_buf)
+        self._drift_buf *= self.theta * self.dt
+        self.x_prev += self._drift_buf
+        self.x_prev += self._noise_buf
+        return self.x_prev.copy()
 
     def reset(self):
-        self.x_prev = self.x0 if self.x0 is not None else np.zeros_like(self.mu)
+        if self.x0 is not None:
+            self.x_prev = np.array(self.x0, dtype=np.float64)
+        else:
+            self.x_prev = np.zeros(self.mu.shape)
 
     def __repr__(self):
         return "OrnsteinUhlenbeckActionNoise(mu={}, sigma={})".format(
@@ -37,34 +57,67 @@ class OUActionNoise(object):
 
 class ReplayBuffer(object):
     def __init__(self, max_size, input_shape, n_actions):
-        self.mem_size = max_size
+        # Round up to a power of two so the write index wraps with a bit mask.
+        self.mem_size = 1 << (max_size - 1).bit_length()
+        self._mask = self.mem_size - 1
+        self._idx = 0
         self.mem_cntr = 0
-        self.state_memory = np.zeros((self.mem_size, *input_shape))
-        self.new_state_memory = np.zeros((self.mem_size, *input_shape))
-        self.action_memory = np.zeros((self.mem_size, n_actions))
-        self.reward_memory = np.zeros(self.mem_size)
-        self.terminal_memory = np.zeros(self.mem_size, dtype=bool)
+        # Page-locked host memory so batches can be copied to the GPU asynchronously.
+        pin = T.cuda.is_available()
+        # Observations dominate the buffer, so they are kept in float16 and only
+        # widened back to float32 on the device after the copy.
+        self.state_memory = T.zeros(
+            (self.mem_size, *input_shape), dtype=T.float16, pin_memory=pin
+        )
+        self.new_state_memory = T.zeros(
+            (self.mem_size, *input_shape), dtype=T.float16, pin_memory=pin
+        )
+        self.action_memory = T.zeros(
+            (self.mem_size, n_actions), dtype=T.float32, pin_memory=pin
+        )
+        self.reward_memory = T.zeros(self.mem_size, dtype=T.float32, pin_memory=pin)
+        self.terminal_memory = T.zeros(self.mem_size, dtype=T.bool, pin_memory=pin)
 
     def store_transition(self, state, action, reward, state_, done):
-        index = self.mem_cntr % self.mem_size
-        self.state_memory[index] = state
-        self.new_state_memory[index] = state_
-        self.action_memory[index] = action
-        self.reward_memory[index] = reward
-        self.terminal_memory[index] = 1 - done
+        index = self._idx
+        self.state_memory[index].copy_(T.from_numpy(np.asarray(state)))
+        self.new_state_memory[index].copy_(T.from_numpy(np.asarray(state_)))
+        self.action_memory[index].copy_(T.from_numpy(np.asarray(action)))
+        self.reward_memory[index] = float(reward)
+        self.terminal_memory[index] = not done
         # self.terminal_memory[index] = done
+        self._idx = (index + 1) & self._mask
         self.mem_cntr += 1
 
-    def sample_buffer(self, batch_size):
+    def empty_batch(self, batch_size):
+        memories = (
+            self.state_memory,
+            self.action_memory,
+            self.reward_memory,
+            self.new_state_memory,
+            self.terminal_memory,
+        )
+        return tuple(
+            T.empty(
+                (batch_size, *memory.shape[1:]),
+                dtype=memory.dtype,
+                pin_memory=memory.is_pinned(),
+            )
+            for memory in memories
+        )
+
+    def sample_buffer(self, batch_size, out=None):
         max_mem = min(self.mem_cntr, self.mem_size)
 
-        batch = np.random.choice(max_mem, batch_size)
+        batch = T.randint(0, max_mem, (batch_size,))
 
-        states = self.state_memory[batch]
-        actions = self.action_memory[batch]
-        rewards = self.reward_memory[batch]
-        states_ = self.new_state_memory[batch]
-        terminal = self.terminal_memory[batch]
+        if out is None:
+            out = (None,) * 5
+        states = T.index_select(self.state_memory, 0, batch, out=out[0])
+        actions = T.index_select(self.action_memory, 0, batch, out=out[1])
+        rewards = T.index_select(self.reward_memory, 0, batch, out=out[2])
+        states_ = T.index_select(self.new_state_memory, 0, batch, out=out[3])
+        terminal = T.index_select(self.terminal_memory, 0, batch, out=out[4])
 
         return states, actions, rewards, states_, terminal
 
@@ -79,6 +132,7 @@ class CriticNetwork(nn.Module):
         n_actions,
         name,
         chkpt_dir="tmp/ddpg",
+        device="cuda:0",
     ):
         super(CriticNetwork, self).__init__()
         # try starting with a small beta and then increase the beta after a few episodes when the critic loss is small
@@ -87,45 +141,45 @@ class CriticNetwork(nn.Module):
         self.fc2_dims = fc2_dims
         self.n_actions = n_actions
         self.checkpoint_file = os.path.join(chkpt_dir, name + "_ddpg")
-        self.device = T.device("cuda:0")
+        self.device = T.device(device)
 
-        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims).to(self.device)
+        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims)
         f1 = 1.0 / np.sqrt(self.fc1.weight.data.size()[0])
-        T.nn.init.uniform_(self.fc1.weight.data, -f1, f1).to(self.device)
-        T.nn.init.uniform_(self.fc1.bias.data, -f1, f1).to(self.device)
-        self.bn1 = nn.LayerNorm(self.fc1_dims).to(self.device)
+        T.nn.init.uniform_(self.fc1.weight.data, -f1, f1)
+        T.nn.init.uniform_(self.fc1.bias.data, -f1, f1)
+        self.bn1 = nn.LayerNorm(self.fc1_dims)
 
-        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims).to(self.device)
+        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims)
         f2 = 1.0 / np.sqrt(self.fc2.weight.data.size()[0])
 
-        T.nn.init.uniform_(self.fc2.weight.data, -f2, f2).to(self.device)
-        T.nn.init.uniform_(self.fc2.bias.data, -f2, f2).to(self.device)
+        T.nn.init.uniform_(self.fc2.weight.data, -f2, f2)
+        T.nn.init.uniform_(self.fc2.bias.data, -f2, f2)
 
-        self.bn2 = nn.LayerNorm(self.fc2_dims).to(self.device)
-        # self.bn1 = nn.BatchNorm1d(self.fc1_dims).to(self.device)
-        # self.bn2 = nn.BatchNorm1d(self.fc2_dims).to(self.device)
+        self.bn2 = nn.LayerNorm(self.fc2_dims)
+        # self.bn1 = nn.BatchNorm1d(self.fc1_dims)
+        # self.bn2 = nn.BatchNorm1d(self.fc2_dims)
 
-        self.action_value = nn.Linear(self.n_actions, self.fc2_dims).to(self.device)
+        self.action_value = nn.Linear(self.n_actions, self.fc2_dims)
         f4 = 0.003
-        self.q = nn.Linear(self.fc2_dims, 1).to(self.device)
-        T.nn.init.uniform_(self.q.weight.data, -f4, f4).to(self.device)
-        T.nn.init.uniform_(self.q.bias.data, -f4, f4).to(self.device)
-
-        self.optimizer = optim.Adam(self.parameters(), lr=beta)
+        self.q = nn.Linear(self.fc2_dims, 1)
+        T.nn.init.uniform_(self.q.weight.data, -f4, f4)
+        T.nn.init.uniform_(self.q.bias.data, -f4, f4)
 
         self.to(self.device)
+        self.optimizer = optim.Adam(
+            self.parameters(), lr=beta, fused=self.device.type == "cuda"
+        )
 
     def forward(self, state, action):
-        state_value = self.fc1(state).to(self.device)
-        state_value = self.bn1(state_value).to(self.device)
-        state_value = F.relu(state_value).to(self.device)
-        state_value = self.fc2(state_value).to(self.device)
-        state_value = self.bn2(state_value).to(self.device)
-        state_value = F.relu(state_value).to(self.device)
+        state_value = F.relu(layer_norm(self.fc1(state), self.bn1))
+        state_value = F.relu(layer_norm(self.fc2(state_value), self.bn2))
 
-        action_value = F.relu(self.action_value(action)).to(self.device)
-        state_action_value = F.relu(T.add(state_value, action_value)).to(self.device)
-        state_action_value = self.q(state_action_value).to(self.device)
+        action_value = F.relu(self.action_value(action))
+        state_action_value = F.relu(T.add(state_value, action_value))
+        # Q values are of order 1-10 while per-step rewards are ~0.01-0.1, so the
+        # output head stays in float32 even when the body runs under autocast.
+        with T.autocast("cuda", enabled=False):
+            state_action_value = self.q(state_action_value.float())
 
         return state_action_value
 
@@ -148,9 +202,10 @@ class ActorNetwork(nn.Module):
         n_actions,
         name,
         chkpt_dir="tmp/ddpg",
+        device="cuda:0",
     ):
         super(ActorNetwork, self).__init__()
-        self.device = T.device("cuda:0")
+        self.device = T.device(device)
 
         self.input_dims = input_dims
         self.fc1_dims = fc1_dims
@@ -158,35 +213,36 @@ class ActorNetwork(nn.Module):
         self.n_actions = n_actions
         self.checkpoint_file = os.path.join(chkpt_dir, name + "_ddpg")
 
-        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims).to(self.device)
+        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims)
         f1 = 1.0 / np.sqrt(self.fc1.weight.data.size()[0])
-        T.nn.init.uniform_(self.fc1.weight.data, -f1, f1).to(self.device)
-        T.nn.init.uniform_(self.fc1.bias.data, -f1, f1).to(self.device)
-        self.bn1 = nn.LayerNorm(self.fc1_dims).to(self.device)
+        T.nn.init.uniform_(self.fc1.weight.data, -f1, f1)
+        T.nn.init.uniform_(self.fc1.bias.data, -f1, f1)
+        self.bn1 = nn.LayerNorm(self.fc1_dims)
 
-        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims).to(self.device)
+        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims)
         # f2 = 0.002
         f2 = 1.0 / np.sqrt(self.fc2.weight.data.size()[0])
-        T.nn.init.uniform_(self.fc2.weight.data, -f2, f2).to(self.device)
-        T.nn.init.uniform_(self.fc2.bias.data, -f2, f2).to(self.device)
-        self.bn2 = nn.LayerNorm(self.fc2_dims).to(self.device)
+        T.nn.init.uniform_(self.fc2.weight.data, -f2, f2)
+        T.nn.init.uniform_(self.fc2.bias.data, -f2, f2)
+        self.bn2 = nn.LayerNorm(self.fc2_dims)
 
         f4 = 0.003
-        self.mu = nn.Linear(self.fc2_dims, self.n_actions).to(self.device)
-        T.nn.init.uniform_(self.mu.weight.data, -f4, f4).to(self.device)
-        T.nn.init.uniform_(self.mu.bias.data, -f4, f4).to(self.device)
+        self.mu = nn.Linear(self.fc2_dims, self.n_actions)
+        T.nn.init.uniform_(self.mu.weight.data, -f4, f4)
+        T.nn.init.uniform_(self.mu.bias.data, -f4, f4)
 
-        self.optimizer = optim.Adam(self.parameters(), lr=alpha)
         self.to(self.device)
+        # alpha=None builds an inference-only copy with no optimizer state.
+        self.optimizer = None
+        if alpha is not None:
+            self.optimizer = optim.Adam(
+                self.parameters(), lr=alpha, fused=self.device.type == "cuda"
+            )
 
     def forward(self, state):
-        x = self.fc1(state).to(self.device)
-        x = self.bn1(x).to(self.device)
-        x = F.relu(x).to(self.device)
-        x = self.fc2(x).to(self.device)
-        x = self.bn2(x).to(self.device)
-        x = F.relu(x).to(self.device)
-        x = T.tanh(self.mu(x)).to(self.device)
+        x = F.relu(layer_norm(self.fc1(state), self.bn1))
+        x = F.relu(layer_norm(self.fc2(x), self.bn2))
+        x = T.tanh(self.mu(x))
 
         return x
 
@@ -212,9 +268,20 @@ class Agent(object):
         batch_size,
         gamma=0.99,
         max_size=100000,
+        device="cuda:0",
+        actor_sync_interval=100,
     ):
         self.gamma = gamma
         self.tau = tau
+        self.learn_step_cntr = 0
+        self.actor_sync_interval = actor_sync_interval
+        self.device = T.device(device)
+        # bf16 autocast needs no GradScaler, but only pays off on GPUs with native
+        # bf16 (Ampere, compute capability 8.0, and newer); older ones emulate it.
+        self.use_amp = (
+            self.device.type == "cuda"
+            and T.cuda.get_device_capability(self.device)[0] >= 8
+        )
         self.memory = ReplayBuffer(max_size, input_dims, n_actions)
         self.batch_size = batch_size
         self.noise = OUActionNoise(mu=np.zeros(n_actions))
@@ -226,6 +293,7 @@ class Agent(object):
             layer2_size,
             n_actions=n_actions,
             name="Actor",
+            device=self.device,
         )
         self.critic = CriticNetwork(
             beta,
@@ -234,6 +302,7 @@ class Agent(object):
             layer2_size,
             n_actions=n_actions,
             name="Critic",
+            device=self.device,
         )
 
         self.target_actor = ActorNetwork(
@@ -243,6 +312,7 @@ class Agent(object):
             layer2_size,
             n_actions=n_actions,
             name="TargetActor",
+            device=self.device,
         )
         self.target_critic = CriticNetwork(
             beta,
@@ -251,18 +321,87 @@ class Agent(object):
             layer2_size,
             n_actions=n_actions,
             name="TargetCritic",
+            device=self.device,
         )
 
-        self.actor_loss, self.critic_loss = [], []
-        self.update_network_parameters(tau=1)
+        # Batch-1 inference is faster on the CPU than paying for a kernel launch
+        # and two PCIe transfers, so actions come from a periodically synced copy.
+        # The lock keeps a choose_action() from reading a half-updated copy.
+        self.cpu_actor_lock = threading.Lock()
+        self.cpu_actor = ActorNetwork(
+            None,
+            input_dims,
+            layer1_size,
+            layer2_size,
+            n_actions=n_actions,
+            name="CPUActor",
+            device="cpu",
+        ).eval()
+
+        # The networks are small fixed-shape MLPs, so kernel launches dominate;
+        # torch.compile fuses the Linear/LayerNorm/ReLU chains (PyTorch >= 2.0).
+        if hasattr(T, "compile"):
+            self.actor = T.compile(self.actor)
+            self.critic = T.compile(self.critic)
+            self.target_actor = T.compile(self.target_actor)
+            self.target_critic = T.compile(self.target_critic)
+
+        # Double-buffered prefetch: the next batch is sampled into pinned staging
+        # tensors and copied to the device on a side stream while learn() runs.
+        self._copy_stream = (
+            T.cuda.Stream(self.device) if self.device.type == "cuda" else None
+        )
+        self._staging = [self.memory.empty_batch(batch_size) for _ in range(2)]
+        self._staging_events = [None, None]
+        self._staging_idx = 0
+        self._next_batch = None
+
+        # Losses are summed on the device and only read back through the
+        # properties below, so learn() never waits on the GPU for .item().
+        self._actor_loss_sum = T.zeros((), device=self.device)
+        self._critic_loss_sum = T.zeros((), device=self.device)
+
+        # All work on the networks and loss sums runs on this stream, so it is
+        # ordered without syncing against the default stream. It starts after
+        # the initialisation queued on the default stream above.
+        self.learn_stream = None
+        if self.device.type == "cuda":
+            self.learn_stream = T.cuda.Stream(self.device)
+            self.learn_stream.wait_stream(T.cuda.current_stream(self.device))
+
+        self.reset_losses()
+        with self.on_learn_stream():
+            self.update_network_parameters(tau=1)
+            self.update_cpu_actor()
+
+    def on_learn_stream(self):
+        if self.learn_stream is None:
+            return contextlib.nullcontext()
+        return T.cuda.stream(self.learn_stream)
+
+    def reset_losses(self):
+        with self.on_learn_stream():
+            self._actor_loss_sum.zero_()
+            self._critic_loss_sum.zero_()
+        self._loss_steps = 0
+
+    @property
+    def actor_loss(self):
+        """Mean actor loss over the learn steps since the last reset_losses()."""
+        with self.on_learn_stream():
+            return self._actor_loss_sum.item() / max(self._loss_steps, 1)
+
+    @property
+    def critic_loss(self):
+        """Mean critic loss over the learn steps since the last reset_losses()."""
+        with self.on_learn_stream():
+            return self._critic_loss_sum.item() / max(self._loss_steps, 1)
 
     def choose_action(self, observation):
-        self.actor.eval()
-        observation = T.tensor(observation, dtype=T.float).to(self.actor.device)
-        mu = self.actor.forward(observation).to(self.actor.device)
-        mu_prime = mu + T.tensor(self.noise(), dtype=T.float).to(self.actor.device)
-        self.actor.train()
-        return mu_prime.cpu().detach().numpy()
+        with T.no_grad(), self.cpu_actor_lock:
+            observation = T.from_numpy(observation.astype(np.float32))
+            mu = self.cpu_actor.forward(observation).numpy()
+        return mu + self.noise()
 
     def remember(self, state, action, reward, new_state, done):
         self.memory.store_transition(state, action, reward, new_state, done)
@@ -270,90 +409,116 @@ class Agent(object):
     def learn(self):
         if self.memory.mem_cntr < self.batch_size:
             return
-        state, action, reward, new_state, done = self.memory.sample_buffer(
-            self.batch_size
-        )
+        with self.on_learn_stream():
+            self.learn_step()
 
-        state = T.tensor(state, dtype=T.float).to(self.critic.device)
-        action = T.tensor(action, dtype=T.float).to(self.critic.device)
-        reward = T.tensor(reward, dtype=T.float).to(self.critic.device)
-        new_state = T.tensor(new_state, dtype=T.float).to(self.critic.device)
-        done = T.tensor(done).to(self.critic.device)
+    def learn_step(self):
+        state, action, reward, new_state, done = self.take_batch()
+        state, new_state = state.float(), new_state.float()
 
-        self.target_actor.eval()
-        self.target_critic.eval()
-        self.critic.eval()
-        target_actions = self.target_actor.forward(new_state)
-        critic_value_ = self.target_critic.forward(new_state, target_actions)
-        critic_value = self.critic.forward(state, action)
+        # The TD target is built in float32: bf16 rounding of Q would be as large
+        # as the reward signal it is supposed to carry.
+        with T.no_grad():
+            target_actions = self.target_actor.forward(new_state)
+            critic_value_ = self.target_critic.forward(new_state, target_actions)
 
-        target = []
-        for j in range(self.batch_size):
-            target.append(reward[j] + self.gamma * critic_value_[j] * int(done[j]))
-
-        target = T.tensor(target).to(self.critic.device)
+        # done holds 1 - done from the replay buffer, masking terminal states
+        target = reward + self.gamma * critic_value_.view(-1) * done.float()
         target = target.view(self.batch_size, 1)
 
-        self.critic.train()
-        self.critic.optimizer.zero_grad()
-        critic_loss = F.mse_loss(target, critic_value)
+        with T.autocast("cuda", dtype=T.bfloat16, enabled=self.use_amp):
+            critic_value = self.critic.forward(state, action)
+            critic_loss = F.mse_loss(target, critic_value)
+
+        self.critic.optimizer.zero_grad(set_to_none=True)
         critic_loss.backward()
-        self.critic_loss = critic_loss.item()
+        self._critic_loss_sum += critic_loss.detach()
         self.critic.optimizer.step()
 
-        self.critic.eval()
-        self.actor.optimizer.zero_grad()
-        mu = self.actor.forward(state)
-        self.actor.train()
-        actor_loss = -self.critic.forward(state, mu)
-        actor_loss = T.mean(actor_loss)
+        with T.autocast("cuda", dtype=T.bfloat16, enabled=self.use_amp):
+            mu = self.actor.forward(state)
+            actor_loss = -self.critic.forward(state, mu)
+            actor_loss = T.mean(actor_loss)
+
+        self.actor.optimizer.zero_grad(set_to_none=True)
         actor_loss.backward()
-        self.actor_loss = actor_loss.item()
+        self._actor_loss_sum += actor_loss.detach()
+        self._loss_steps += 1
         self.actor.optimizer.step()
 
         self.update_network_parameters()
 
-    def update_network_parameters(self, tau=None):
-        if tau is None:
-            tau = self.tau
+        self.learn_step_cntr += 1
+        if self.learn_step_cntr % self.actor_sync_interval == 0:
+            self.update_cpu_actor()
 
-        actor_params = self.actor.named_parameters()
-        critic_params = self.critic.named_parameters()
-        target_actor_params = self.target_actor.named_parameters()
-        target_critic_params = self.target_critic.named_parameters()
+        # Queue the next batch's copy now so it overlaps with the kernels above.
+        self.prefetch_batch()
 
-        critic_state_dict = dict(critic_params)
-        actor_state_dict = dict(actor_params)
-        target_critic_state_dict = dict(target_critic_params)
-        target_actor_state_dict = dict(target_actor_params)
+    def prefetch_batch(self):
+        i = self._staging_idx
+        self._staging_idx = 1 - i
+        if self._staging_events[i] is not None:
+            # The copy that last read this staging buffer has to finish first.
+            self._staging_events[i].synchronize()
+        batch = self.memory.sample_buffer(self.batch_size, out=self._staging[i])
 
-        for name in critic_state_dict:
-            critic_state_dict[name] = (
-                tau * critic_state_dict[name].clone()
-                + (1 - tau) * target_critic_state_dict[name].clone()
+        if self._copy_stream is None:
+            self._next_batch = batch
+            return
+        with T.cuda.stream(self._copy_stream):
+            self._next_batch = tuple(
+                t.to(self.device, non_blocking=True) for t in batch
             )
+            self._staging_events[i] = self._copy_stream.record_event()
+
+    def take_batch(self):
+        if self._next_batch is None:
+            self.prefetch_batch()
+        batch, self._next_batch = self._next_batch, None
+
+        if self._copy_stream is not None:
+            stream = T.cuda.current_stream(self.device)
+            stream.wait_stream(self._copy_stream)
+            for t in batch:
+                # The tensors were allocated on the copy stream.
+                t.record_stream(stream)
+        return batch
+
+    def update_cpu_actor(self):
+        with T.no_grad(), self.cpu_actor_lock:
+            for cpu_param, param in zip(
+                self.cpu_actor.parameters(), self.actor.parameters()
+            ):
+                cpu_param.copy_(param)
 
-        self.target_critic.load_state_dict(critic_state_dict)
-
-        for name in actor_state_dict:
-            actor_state_dict[name] = (
-                tau * actor_state_dict[name].clone()
-                + (1 - tau) * target_actor_state_dict[name].clone()
-            )
+    def update_network_parameters(self, tau=None):
+        if tau is None:
+            tau = self.tau
 
-        self.target_actor.load_state_dict(actor_state_dict)
+        with T.no_grad():
+            for target, source in (
+                (self.target_critic, self.critic),
+                (self.target_actor, self.actor),
+            ):
+                target_params = list(target.parameters())
+                T._foreach_mul_(target_params, 1 - tau)
+                T._foreach_add_(target_params, list(source.parameters()), alpha=tau)
 
     def save_models(self):
-        self.actor.save_checkpoint()
-        self.target_actor.save_checkpoint()
-        self.critic.save_checkpoint()
-        self.target_critic.save_checkpoint()
+        with self.on_learn_stream():
+            self.actor.save_checkpoint()
+            self.target_actor.save_checkpoint()
+            self.critic.save_checkpoint()
+            self.target_critic.save_checkpoint()
 
     def load_models(self):
-        self.actor.load_checkpoint()
-        self.target_actor.load_checkpoint()
-        self.critic.load_checkpoint()
-        self.target_critic.load_checkpoint()
+        with self.on_learn_stream():
+            self.actor.load_checkpoint()
+            self.target_actor.load_checkpoint()
+            self.critic.load_checkpoint()
+            self.target_critic.load_checkpoint()
+            self.update_cpu_actor()
 
     def check_actor_params(self):
         current_actor_params = self.actor.named_parameters()
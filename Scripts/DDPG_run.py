@@ -4,19 +4,79 @@ import os
 import numpy as np
 import gym
 import panda_gym
-from multiprocessing import Pool
+import torch as T
+import torch.multiprocessing as mp
 from DDPGNetwork import Agent
 import time
-
-
-def run(run):
+import queue
+import threading
+
+
+def collect(env, agent, transitions, n_episodes):
+    """Step the environment with the current policy and queue every transition.
+
+    Runs on a background thread so the simulator steps while the main thread
+    is busy in agent.learn(). Any exception is queued, not raised, so the
+    consumer re-raises it once instead of waiting forever.
+    """
+    try:
+        for _ in range(n_episodes):
+            observation = env.reset()
+            observation = np.concatenate(
+                [observation["observation"], observation["desired_goal"]]
+            )
+            done = False
+            agent.noise.reset()
+            while not done:
+                action = agent.choose_action(observation)
+                new_state, reward, done, info = env.step(action)
+                new_state = np.concatenate(
+                    [new_state["observation"], new_state["desired_goal"]]
+                )
+                transitions.put((observation, action, reward, new_state, done))
+                observation = new_state
+    except BaseException as e:
+        # next_transition() re-raises this in the consumer. Don't block forever
+        # if the consumer has already died and left the queue full.
+        try:
+            transitions.put(e, timeout=10.0)
+        except queue.Full:
+            pass
+
+
+def next_transition(transitions, producer, timeout=1.0):
+    """Pop the next transition, re-raising any error from the producer thread."""
+    while True:
+        try:
+            item = transitions.get(timeout=timeout)
+        except queue.Empty:
+            if not producer.is_alive():
+                raise RuntimeError("collect() thread exited without a transition")
+            continue
+        if isinstance(item, BaseException):
+            raise RuntimeError("collect() thread failed") from item
+        return item
+
+
+def run(run, exp_name, task, reward_type):
     cwd = os.path.dirname(os.path.realpath(__file__))
 
-    global EXP_NAME, TASK, REWARD
+    # Spread the independent runs over all visible GPUs instead of stacking
+    # every run on cuda:0.
+    n_gpus = T.cuda.device_count()
+    if n_gpus > 0:
+        device = T.device(f"cuda:{run % n_gpus}")
+        T.cuda.set_device(device)
+    else:
+        print(
+            f"Run {run}: no CUDA device found, training on the CPU (this is slow)",
+            flush=True,
+        )
+        device = T.device("cpu")
 
-    env = gym.make(f"Panda{TASK}{REWARD}-v2", render=False)
+    env = gym.make(f"Panda{task}{reward_type}-v2", render=False)
 
-    os.makedirs(f"{cwd}/../Data/{EXP_NAME}/Run_{run}", exist_ok=True)
+    os.makedirs(f"{cwd}/../Data/{exp_name}/Run_{run}", exist_ok=True)
     obs = env.reset()
     obs_dim = len(np.concatenate([obs["observation"], obs["desired_goal"]]))
     agent = Agent(
@@ -28,38 +88,42 @@ def run(run):
         layer1_size=400,
         layer2_size=300,
         n_actions=env.action_space.shape[0],
+        device=device,
     )
     score_history, actor_loss, critic_loss = [], [], []
-    for i in range(2500):
-        observation = env.reset()
-        observation = np.concatenate(
-            [observation["observation"], observation["desired_goal"]]
-        )
+    n_episodes = 2500
+
+    # The env is stepped on a producer thread (acting with the agent's CPU copy
+    # of the actor); learning happens here, on the agent's own CUDA stream.
+    transitions = queue.Queue(maxsize=16)
+    producer = threading.Thread(
+        target=collect, args=(env, agent, transitions, n_episodes), daemon=True
+    )
+    producer.start()
+
+    for i in range(n_episodes):
         done = False
         score = 0
-        agent.noise.reset()
+        agent.reset_losses()
         while not done:
-            action = agent.choose_action(observation)
-            new_state, reward, done, info = env.step(action)
-            new_state = np.concatenate(
-                [new_state["observation"], new_state["desired_goal"]]
+            observation, action, reward, new_state, done = next_transition(
+                transitions, producer
             )
             agent.remember(observation, action, reward, new_state, done)
             agent.learn()
             score += reward
-            obs = new_state
 
         actor_loss.append(agent.actor_loss)
         critic_loss.append(agent.critic_loss)
         score_history.append(score)
-        os.makedirs(f"{cwd}/../Data/{EXP_NAME}/Run_{run}/", exist_ok=True)
+        os.makedirs(f"{cwd}/../Data/{exp_name}/Run_{run}/", exist_ok=True)
         if i % 500 == 0:
             print(
-                f"Saving score_history to {cwd}/../Data/{EXP_NAME}/Run_{run}/Run_{run}_Ep_{i}.npy",
+                f"Saving score_history to {cwd}/../Data/{exp_name}/Run_{run}/Run_{run}_Ep_{i}.npy",
                 flush=True,
             )
             np.save(
-                f"{cwd}/../Data/{EXP_NAME}/Run_{run}/Run_{run}_Ep_{i}.npy",
+                f"{cwd}/../Data/{exp_name}/Run_{run}/Run_{run}_Ep_{i}.npy",
                 np.array(score_history),
             )
 
@@ -73,20 +137,21 @@ def run(run):
             flush=True,
         )
 
-    os.makedirs(f"{cwd}/../Data/{EXP_NAME}/Actor_loss", exist_ok=True)
+    os.makedirs(f"{cwd}/../Data/{exp_name}/Actor_loss", exist_ok=True)
     actor_loss = actor_loss[1:]
     np.save(
-        f"{cwd}/../Data/{EXP_NAME}/Actor_loss/Actor_loss_run_{run}.npy",
+        f"{cwd}/../Data/{exp_name}/Actor_loss/Actor_loss_run_{run}.npy",
         np.array(actor_loss),
     )
 
-    os.makedirs(f"{cwd}/../Data/{EXP_NAME}/Critic_loss", exist_ok=True)
+    os.makedirs(f"{cwd}/../Data/{exp_name}/Critic_loss", exist_ok=True)
     critic_loss = critic_loss[1:]
     np.save(
-        f"{cwd}/../Data/{EXP_NAME}/Critic_loss/Critic_loss_run_{run}.npy",
+        f"{cwd}/../Data/{exp_name}/Critic_loss/Critic_loss_run_{run}.npy",
         np.array(critic_loss),
     )
-    np.save(f"{cwd}/../Data/{EXP_NAME}/Run_{run}.npy", np.array(score_history))
+    np.save(f"{cwd}/../Data/{exp_name}/Run_{run}.npy", np.array(score_history))
+    producer.join()
     env.close()
     return score_history
 
@@ -113,8 +178,11 @@ def DDPG_main():
     print(f"Starting {EXP_NAME}", flush=True)
 
     run_scores = []
-    pool = Pool(processes=NoRuns)
-    run_scores = pool.map_async(run, rList).get()
+    # CUDA cannot be re-initialised in forked children, so spawn the workers.
+    pool = mp.get_context("spawn").Pool(processes=NoRuns)
+    run_scores = pool.starmap_async(
+        run, [(r, EXP_NAME, TASK, REWARD) for r in rList]
+    ).get()
     pool.close()
     run_scores = np.array(run_scores)
     print(
@@ -11,10 +11,12 @@ class ReplayBuffer:
     def __init__(self, max_size, input_shape, n_actions):
         self.mem_size = max_size
         self.mem_cntr = 0
-        self.state_memory = np.zeros((self.mem_size, *input_shape))
-        self.new_state_memory = np.zeros((self.mem_size, *input_shape))
-        self.action_memory = np.zeros((self.mem_size, n_actions))
-        self.reward_memory = np.zeros(self.mem_size)
+        self.state_memory = np.zeros((self.mem_size, *input_shape), dtype=np.float32)
+        self.new_state_memory = np.zeros(
+            (self.mem_size, *input_shape), dtype=np.float32
+        )
+        self.action_memory = np.zeros((self.mem_size, n_actions), dtype=np.float32)
+        self.reward_memory = np.zeros(self.mem_size, dtype=np.float32)
         self.terminal_memory = np.zeros(self.mem_size, dtype=bool)
 
     def store_transition(self, state, action, reward, state_, done):
@@ -57,22 +59,19 @@ class CriticNetwork(nn.Module):
         self.checkpoint_dir = chkpt_dir
         self.checkpoint_file = os.path.join(self.checkpoint_dir, name + "_td3")
 
-        self.fc1 = nn.Linear(self.input_dims[0] + n_actions, self.fc1_dims).to(
-            self.device
-        )
-        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims).to(self.device)
-        self.q1 = nn.Linear(self.fc2_dims, 1).to(self.device)
-
-        self.optimizer = optim.Adam(self.parameters(), lr=beta)
+        self.fc1 = nn.Linear(self.input_dims[0] + n_actions, self.fc1_dims)
+        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims)
+        self.q1 = nn.Linear(self.fc2_dims, 1)
 
         self.to(self.device)
+        self.optimizer = optim.Adam(
+            self.parameters(), lr=beta, fused=self.device.type == "cuda"
+        )
 
     def forward(self, state, action):
-        q1_action_value = self.fc1(T.cat([state, action], dim=1)).to(self.device)
-        q1_action_value = F.relu(q1_action_value).to(self.device)
-        q1_action_value = self.fc2(q1_action_value).to(self.device)
-        q1_action_value = F.relu(q1_action_value).to(self.device)
-        q1 = self.q1(q1_action_value).to(self.device)
+        q1_action_value = F.relu(self.fc1(T.cat([state, action], dim=1)))
+        q1_action_value = F.relu(self.fc2(q1_action_value))
+        q1 = self.q1(q1_action_value)
         return q1
 
     def save_checkpoint(self):
@@ -107,20 +106,19 @@ class ActorNetwork(nn.Module):
         self.checkpoint_dir = chkpt_dir
         self.checkpoint_file = os.path.join(self.checkpoint_dir, name + "_td3")
 
-        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims).to(self.device)
-        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims).to(self.device)
-        self.mu = nn.Linear(self.fc2_dims, self.n_actions).to(self.device)
-
-        self.optimizer = optim.Adam(self.parameters(), lr=alpha)
+        self.fc1 = nn.Linear(*self.input_dims, self.fc1_dims)
+        self.fc2 = nn.Linear(self.fc1_dims, self.fc2_dims)
+        self.mu = nn.Linear(self.fc2_dims, self.n_actions)
 
         self.to(self.device)
+        self.optimizer = optim.Adam(
+            self.parameters(), lr=alpha, fused=self.device.type == "cuda"
+        )
 
     def forward(self, state):
-        prob = self.fc1(state).to(self.device)
-        prob = F.relu(prob).to(self.device)
-        prob = self.fc2(prob).to(self.device)
-        prob = F.relu(prob).to(self.device)
-        mu = T.tanh(self.mu(prob)).to(self.device)
+        prob = F.relu(self.fc1(state))
+        prob = F.relu(self.fc2(prob))
+        mu = T.tanh(self.mu(prob))
         return mu
 
     def save_checkpoint(self):
@@ -218,22 +216,22 @@ class Agent:
         self.update_network_parameters(tau=1)
 
     def choose_action(self, observation):
-        if self.time_step < self.warmup:
-            mu = T.tensor(
-                np.random.normal(scale=self.noise, size=(self.n_actions,))
-            ).to(self.actor.device)
-        else:
-            state = T.tensor(observation, dtype=T.float).to(self.actor.device)
-            mu = self.actor.forward(state).to(self.actor.device)
-
-        mu_prime = mu + T.tensor(np.random.normal(scale=self.noise), dtype=T.float).to(
-            self.actor.device
-        )
-
-        mu_prime = T.clamp(mu_prime, self.min_action[0], self.max_action[0])
+        # Noise is drawn on the actor's device so the only transfer per step is
+        # the final action coming back to the host.
+        device = self.actor.device
+        with T.no_grad():
+            if self.time_step < self.warmup:
+                mu = T.randn(self.n_actions, device=device) * self.noise
+            else:
+                state = T.tensor(observation, dtype=T.float).to(device)
+                mu = self.actor.forward(state)
+
+            mu_prime = mu + T.randn((), device=device) * self.noise
+
+            mu_prime = T.clamp(mu_prime, self.min_action[0], self.max_action[0])
         self.time_step += 1
 
-        return mu_prime.cpu().detach().numpy()
+        return mu_prime.cpu().numpy()
 
     def remember(self, state, action, reward, new_state, done):
         self.memory.store_transition(state, action, reward, new_state, done)
@@ -251,14 +249,17 @@ class Agent:
         state_ = T.tensor(new_state, dtype=T.float).to(self.critic_1.device)
         done = T.tensor(done).to(self.critic_1.device)
 
-        target_actions = self.target_actor.forward(state_)
-        target_actions = target_actions + T.clamp(
-            T.tensor(np.random.normal(scale=0.2)), -0.5, 0.5
-        )
-        target_actions = T.clamp(target_actions, self.min_action[0], self.max_action[0])
+        with T.no_grad():
+            target_actions = self.target_actor.forward(state_)
+            target_actions = target_actions + T.clamp(
+                T.tensor(np.random.normal(scale=0.2)), -0.5, 0.5
+            )
+            target_actions = T.clamp(
+                target_actions, self.min_action[0], self.max_action[0]
+            )
 
-        q1_ = self.target_critic_1.forward(state_, target_actions)
-        q2_ = self.target_critic_2.forward(state_, target_actions)
+            q1_ = self.target_critic_1.forward(state_, target_actions)
+            q2_ = self.target_critic_2.forward(state_, target_actions)
 
         q1 = self.critic_1.forward(state, action)
         q2 = self.critic_2.forward(state, action)
@@ -274,8 +275,8 @@ class Agent:
         target = reward + self.gamma * critic_value_
         target = target.view(self.batch_size, 1)
 
-        self.critic_1.optimizer.zero_grad()
-        self.critic_2.optimizer.zero_grad()
+        self.critic_1.optimizer.zero_grad(set_to_none=True)
+        self.critic_2.optimizer.zero_grad(set_to_none=True)
 
         q1_loss = F.mse_loss(target, q1)
         q2_loss = F.mse_loss(target, q2)
@@ -290,7 +291,7 @@ class Agent:
         if self.learn_step_cntr % self.update_actor_iter != 0:
             return
 
-        self.actor.optimizer.zero_grad()
+        self.actor.optimizer.zero_grad(set_to_none=True)
         actor_q1_loss = self.critic_1.forward(state, self.actor.forward(state))
         actor_loss = -T.mean(actor_q1_loss)
         self.actor_loss = actor_loss.item()
@@ -317,20 +318,19 @@ class Agent:
         target_critic_1 = dict(target_critic_1_params)
         target_critic_2 = dict(target_critic_2_params)
 
-        for name in critic_1:
-            critic_1[name] = (
-                tau * critic_1[name].clone() + (1 - tau) * target_critic_1[name].clone()
-            )
+        with T.no_grad():
+            for name in critic_1:
+                critic_1[name] = (
+                    tau * critic_1[name] + (1 - tau) * target_critic_1[name]
+                )
 
-        for name in critic_2:
-            critic_2[name] = (
-                tau * critic_2[name].clone() + (1 - tau) * target_critic_2[name].clone()
-            )
+            for name in critic_2:
+                critic_2[name] = (
+                    tau * critic_2[name] + (1 - tau) * target_critic_2[name]
+                )
 
-        for name in actor:
-            actor[name] = (
-                tau * actor[name].clone() + (1 - tau) * target_actor[name].clone()
-            )
+            for name in actor:
+                actor[name] = tau * actor[name] + (1 - tau) * target_actor[name]
 
         self.target_critic_1.load_state_dict(critic_1)
         self.target_critic_2.load_state_dict(critic_2)